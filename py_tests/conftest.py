@@ -1,18 +1,39 @@
 """pytest fixtures."""
 
-from collections import OrderedDict
+import importlib.util
+from functools import cache
+from pathlib import Path
 from statistics import mean
 from typing import Any, Literal, Union
+from unittest.mock import MagicMock
 
+import anyio
 import pytest
+from pytest_mock import MockerFixture
 
-from par_run.executor import Command, CommandGroup
+from par_run.executor import Command, CommandGroup, CommandStatus, read_commands_toml
 
 AnyIOBackendT = tuple[Literal["asyncio", "trio"], dict[str, Any]]
 
 
+def _freeze_params(vals: tuple[Any, ...]) -> tuple[Any, ...]:
+    """Make a fixture param tuple hashable so its normalisation can be cached."""
+    return tuple(tuple(val) if isinstance(val, list) else val for val in vals)
+
+
+@cache
+def _norm_command_groups_cached(
+    num_groups: int,
+    num_cmds: Union[int, tuple[int, ...]],
+    num_output_lines: Union[int, tuple[int, ...]],
+    serial: Union[bool, tuple[bool, ...]],
+    success: Union[bool, tuple[bool, ...]],
+) -> tuple[int, tuple[int, ...], tuple[int, ...], tuple[bool, ...], tuple[bool, ...]]:
+    return _norm_generate_command_groups(num_groups, num_cmds, num_output_lines, serial, success)
+
+
 def cmd_group_ids(vals: tuple[int, list[int], list[int], list[bool], list[bool]]) -> str:
-    num_groups, num_cmds, num_output_lines, serial, success = _norm_generate_command_groups(*vals)
+    num_groups, num_cmds, num_output_lines, serial, success = _norm_command_groups_cached(*_freeze_params(vals))
 
     serial_str = str(any(serial))
     success_str = str(all(success))
@@ -27,149 +48,245 @@ def cmd_group_ids(vals: tuple[int, list[int], list[int], list[bool], list[bool]]
     )
 
 
-@pytest.fixture(
-    params=[
-        (1, 2, 1, False, True),
-        (2, 2, 1, False, True),
-        (2, 2, 2, False, True),
-        (2, 3, 3, False, True),
-    ],
-    ids=cmd_group_ids,
+_PAR_SUCCESS_PARAMS = (
+    (1, 2, 1, False, True),
+    (2, 2, 1, False, True),
+    (2, 2, 2, False, True),
+    (2, 3, 3, False, True),
 )
-def mock_command_groups_par_success(request: pytest.FixtureRequest) -> list[CommandGroup]:
-    return generate_command_groups(*request.param)
 
+_SERIAL_SUCCESS_PARAMS = (
+    (1, 2, 1, True, True),
+    (2, 2, 1, True, True),
+    (2, 2, 2, True, True),
+    (2, 3, 3, True, True),
+)
 
-@pytest.fixture(
-    params=[
-        (1, 2, 1, True, True),
-        (2, 2, 1, True, True),
-        (2, 2, 2, True, True),
-        (2, 3, 3, True, True),
-    ],
-    ids=cmd_group_ids,
+_PAR_PART_FAIL_PARAMS = (
+    (1, 3, 1, True, (True, False, True)),
+    (2, 2, 1, True, (True, False, True, False)),
+    (2, 2, 2, True, (True, False, True, False)),
+    (2, 3, 3, True, (True, False, True, False, True, False)),
 )
+
+
+@pytest.fixture(scope="session", params=_PAR_SUCCESS_PARAMS, ids=cmd_group_ids)
+def mock_command_groups_par_success(request: pytest.FixtureRequest) -> list[CommandGroup]:
+    return _ALL_GROUPS[request.param]
+
+
+@pytest.fixture(scope="session", params=_SERIAL_SUCCESS_PARAMS, ids=cmd_group_ids)
 def mock_command_groups_serial_success(request: pytest.FixtureRequest) -> list[CommandGroup]:
-    return generate_command_groups(*request.param)
+    return _ALL_GROUPS[request.param]
 
 
-@pytest.fixture(
-    params=[
-        (1, 3, 1, True, [True, False, True]),
-        (2, 2, 1, True, [True, False, True, False]),
-        (2, 2, 2, True, [True, False, True, False]),
-        (2, 3, 3, True, [True, False, True, False, True, False]),
-    ],
-    ids=cmd_group_ids,
-)
+@pytest.fixture(scope="session", params=_PAR_PART_FAIL_PARAMS, ids=cmd_group_ids)
 def mock_command_groups_par_part_fail(request: pytest.FixtureRequest) -> list[CommandGroup]:
-    return generate_command_groups(*request.param)
+    return _ALL_GROUPS[request.param]
+
 
+def _broadcast(val: Union[Any, list[Any], tuple[Any, ...]], n: int, name: str) -> tuple[Any, ...]:  # noqa: ANN401
+    """Broadcast a scalar to a tuple of length n, or validate the length of a given sequence."""
+    if isinstance(val, (list, tuple)):
+        if len(val) != n:
+            raise ValueError(f"{name} must be a scalar or a sequence of length {n}")
+        return tuple(val)
+    return (val,) * n
 
-def _norm_generate_command_groups(  # noqa: PLR0912
+
+def _norm_generate_command_groups(
     num_groups: int,
-    num_cmds: Union[int, list[int]],
-    num_output_lines: Union[int, list[int]],
-    serial: Union[bool, list[bool]],
-    success: Union[bool, list[bool]],
-) -> tuple[int, list[int], list[int], list[bool], list[bool]]:
-    """
+    num_cmds: Union[int, list[int], tuple[int, ...]],
+    num_output_lines: Union[int, list[int], tuple[int, ...]],
+    serial: Union[bool, list[bool], tuple[bool, ...]],
+    success: Union[bool, list[bool], tuple[bool, ...]],
+) -> tuple[int, tuple[int, ...], tuple[int, ...], tuple[bool, ...], tuple[bool, ...]]:
+    """Normalise the generate_command_groups params to per-group/per-command tuples.
 
     Args:
         num_groups (int): Number of groups to generate
-        num_cmds (Union[int, list[int]]): Number of commands in each group, or a list of the number of commands
-            in each group. Must be the same length as num_groups
-        num_output_lines (Union[int, list[int]]): Number of output lines for each command,
-          or a list of the number of output lines for each command. Must be the same length as num_cmds*num_groups
-        serial (Union[bool, list[bool]]): Whether each group should run serially or in parallel, each group must be
-            a bool or a list of bools the same length as num_cmds*num_groups
-        success (Union[bool, list[bool]]): Whether each command should succeed or fail, each command must be a bool
-            or a list of bools the same length as num_cmds*num_groups
+        num_cmds: Number of commands in each group, scalar or one entry per group
+        num_output_lines: Number of output lines for each command, scalar or one entry per command
+        serial: Whether each group should run serially or in parallel, scalar or one entry per command
+        success: Whether each command should succeed or fail, scalar or one entry per command
 
     Returns:
-        tuple[int, list[int], list[int], list[bool], list[bool]]: _description_
+        The params broadcast to tuples of the appropriate lengths.
     """
     if num_groups < 1:
         raise ValueError("num_groups must be greater than 0")
 
-    if isinstance(num_cmds, list):
-        if len(num_cmds) != num_groups:
-            raise ValueError("num_cmds must be a list the same length as num_groups, or an int")
-        else:
-            pass
-    else:
-        num_cmds = [num_cmds] * num_groups
+    num_cmds = _broadcast(num_cmds, num_groups, "num_cmds")
     tot_cmds = sum(num_cmds)
-    if isinstance(num_output_lines, list):
-        if len(num_output_lines) != tot_cmds:
-            raise ValueError("num_output_lines must be an int or the same length as num_cmds*num_groups")
-        else:
-            pass
-    else:
-        num_output_lines = [num_output_lines] * tot_cmds
-    if isinstance(serial, list):
-        if len(serial) != tot_cmds:
-            raise ValueError("serial must be a list the same length as num_groups, or an bool")
-        else:
-            pass
-    else:
-        serial = [serial] * tot_cmds
-
-    if isinstance(success, list):
-        if len(success) != tot_cmds:
-            raise ValueError("success must be a list the same length as num_cmds, or an bool")
-        else:
-            pass
-    else:
-        success = [success] * tot_cmds
+    num_output_lines = _broadcast(num_output_lines, tot_cmds, "num_output_lines")
+    serial = _broadcast(serial, tot_cmds, "serial")
+    success = _broadcast(success, tot_cmds, "success")
     return num_groups, num_cmds, num_output_lines, serial, success
 
 
+@cache
+def _make_command(name: str, cmd: str) -> Command:
+    """Validate each unique (name, cmd) pair once; callers copy the cached model."""
+    return Command(name=name, cmd=cmd)
+
+
 def generate_command_groups(
     num_groups: int,
-    num_cmds: Union[int, list[int]],
-    num_output_lines: Union[int, list[int]],
-    serial: Union[bool, list[bool]],
-    success: Union[bool, list[bool]],
-) -> CommandGroup:
-    num_groups, num_cmds, num_output_lines, serial, success = _norm_generate_command_groups(
-        num_groups,
-        num_cmds,
-        num_output_lines,
-        serial,
-        success,
+    num_cmds: Union[int, list[int], tuple[int, ...]],
+    num_output_lines: Union[int, list[int], tuple[int, ...]],
+    serial: Union[bool, list[bool], tuple[bool, ...]],
+    success: Union[bool, list[bool], tuple[bool, ...]],
+) -> list[CommandGroup]:
+    num_groups, num_cmds, num_output_lines, serial, success = _norm_command_groups_cached(
+        *_freeze_params((num_groups, num_cmds, num_output_lines, serial, success)),
     )
 
-    echo = "Hello, World!"
+    echo = "Hello, World!"  # printf is a shell builtin; echo may exec a separate binary
     cmd_groups: list[CommandGroup] = []
     for group_ix in range(num_groups):
-        cmds = OrderedDict()
+        cmds: dict[str, Command] = {}
+        echo_prefix = " && ".join(f"printf '{echo_ix}:{echo}\\n'" for echo_ix in range(num_output_lines[group_ix]))
         for cmd_ix in range(num_cmds[group_ix]):
             cmd_name = f"test_{cmd_ix}"
-            multi_part_cmds = [f"echo '{echo_ix}:{echo}'" for echo_ix in range(num_output_lines[group_ix])]
-            multi_part_cmds.append(f"exit {0 if success[cmd_ix] else 1}")
-            cmd_str = " && ".join(multi_part_cmds)
-            cmds[cmd_name] = Command(name=cmd_name, cmd=cmd_str)
+            cmd_str = f"{echo_prefix} && exit {0 if success[cmd_ix] else 1}"
+            cmds[cmd_name] = _make_command(cmd_name, cmd_str).model_copy(deep=True)
         cmd_groups.append(CommandGroup(name=f"test_group{group_ix}", cmds=cmds, serial=serial[group_ix]))
     return cmd_groups
 
 
-@pytest.fixture(
-    params=[
-        pytest.param(("asyncio", {"use_uvloop": True}), id="asyncio+uvloop"),
-        pytest.param(("asyncio", {"use_uvloop": False}), id="asyncio"),
-    ],
-)
-def anyio_backend(request: pytest.FixtureRequest) -> AnyIOBackendT:
-    return request.param  # type: ignore
+def assert_group_success(group: CommandGroup) -> None:
+    """Assert the all-commands-succeeded invariants in a single pass over the group."""
+    for cmd in group.cmds.values():
+        assert cmd.status.completed()
+        assert cmd.status == CommandStatus.SUCCESS
+        assert cmd.ret_code == 0
+        assert cmd.num_non_empty_lines == cmd.cmd.count("printf")
+        assert cmd.unflushed == []
+
+
+# Build every parametrized group matrix once at import; the fixtures above are dict lookups.
+_ALL_GROUPS = {
+    params: generate_command_groups(*params)
+    for params in _PAR_SUCCESS_PARAMS + _SERIAL_SUCCESS_PARAMS + _PAR_PART_FAIL_PARAMS
+}
+
+
+@pytest.fixture(scope="session", params=["pyproject.toml", "commands.toml"])
+def parsed_command_groups(request: pytest.FixtureRequest) -> tuple[str, list[CommandGroup]]:
+    """Parse each commands file once per session; assertions on the result are read-only."""
+    return request.param, read_commands_toml(request.param)
+
+
+class _FakeProcessStream:
+    """Async-iterable stand-in for a subprocess stdout stream."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self._chunks = chunks
+
+    def __aiter__(self) -> "_FakeProcessStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if not self._chunks:
+            raise StopAsyncIteration
+        return self._chunks.pop(0)
+
+
+class _FakeProcess:
+    """Minimal stand-in for the process returned by anyio.open_process."""
+
+    def __init__(self, ret_code: int, output: bytes) -> None:
+        self.stdout = _FakeProcessStream([output] if output else [])
+        self.returncode = ret_code
+
+    async def __aenter__(self) -> "_FakeProcess":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    async def wait(self) -> int:
+        return self.returncode
+
+
+@pytest.fixture()
+def fake_open_process(mocker: MockerFixture) -> MagicMock:
+    """Serve canned output for the generated echo/exit commands without forking a shell."""
+
+    async def _open(command: str, **_kwargs: Any) -> _FakeProcess:  # noqa: ANN401
+        parts = [part.strip() for part in command.split("&&")]
+        lines = [
+            part.split("printf ", 1)[1].strip("'").replace("\\n", "") for part in parts if part.startswith("printf ")
+        ]
+        ret_code = int(parts[-1].split()[-1]) if parts[-1].startswith("exit ") else 0
+        output = "".join(f"{line}\n" for line in lines).encode()
+        return _FakeProcess(ret_code, output)
+
+    return mocker.patch("par_run.executor.anyio.open_process", side_effect=_open)
+
+
+class _FakeHungStream:
+    """Yields one line of output then blocks until cancelled by the group timeout."""
+
+    def __init__(self) -> None:
+        self._sent = False
+
+    def __aiter__(self) -> "_FakeHungStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if not self._sent:
+            self._sent = True
+            return b"Hello, World!\n"
+        await anyio.sleep_forever()
+        raise StopAsyncIteration  # pragma: no cover
+
+
+class _FakeHungProcess:
+    """Process stand-in that never exits, forcing the executor's timeout path."""
+
+    def __init__(self) -> None:
+        self.stdout = _FakeHungStream()
+        self.returncode = None
+
+    async def __aenter__(self) -> "_FakeHungProcess":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    async def wait(self) -> int:
+        await anyio.sleep_forever()
+        return 0  # pragma: no cover
+
+
+@pytest.fixture()
+def fake_proc(mocker: MockerFixture) -> MagicMock:
+    """Patch anyio.open_process with a process that hangs after one line of output."""
+
+    async def _open(command: str, **_kwargs: Any) -> _FakeHungProcess:  # noqa: ANN401, ARG001
+        return _FakeHungProcess()
+
+    return mocker.patch("par_run.executor.anyio.open_process", side_effect=_open)
+
+
+@pytest.fixture()
+def pid_file(tmp_path: Path, mocker: MockerFixture) -> Path:
+    """Patch par_run.cli.PID_FILE to a per-test path and return it."""
+    path = tmp_path / ".par-run.uvicorn.pid"
+    mocker.patch("par_run.cli.PID_FILE", str(path))
+    return path
+
+
+_HAS_UVLOOP = importlib.util.find_spec("uvloop") is not None
 
 
 @pytest.fixture(
     params=[
-        pytest.param(("asyncio", {"use_uvloop": True}), id="asyncio+uvloop"),
-        pytest.param(("asyncio", {"use_uvloop": False}), id="asyncio"),
-        pytest.param(("trio", {}), id="trio"),
+        pytest.param(("asyncio", {"use_uvloop": _HAS_UVLOOP}), id="asyncio"),
+        pytest.param(("trio", {}), id="trio", marks=pytest.mark.slow),
     ],
 )
-def anyio_backend_asyncio(request: pytest.FixtureRequest) -> tuple[str, dict[str, Any]]:
+def anyio_backend(request: pytest.FixtureRequest) -> AnyIOBackendT:
+    """Backend for async tests: uvloop's C event loop when available, trio behind -m slow."""
     return request.param
@@ -1,9 +1,12 @@
-import itertools
-from collections import OrderedDict
+import copy
+import functools
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Optional
+from unittest.mock import MagicMock
 
-import psutil
 import pytest
+import typer
 from pytest_mock import MockerFixture
 from typer.testing import CliRunner
 
@@ -23,86 +26,102 @@ from par_run.cli import (
     get_process_port,
     get_web_server_status,
     list_uvicorn_processes,
+    run,
     start_web_server,
     stop_web_server,
 )
-from par_run.executor import Command, CommandGroup, CommandStatus
+from par_run.executor import Command, CommandGroup, CommandStatus, ProcessingStrategy
 
-runner = CliRunner()
+runner = CliRunner(mix_stderr=False)
 
 
-def test_run(mocker: MockerFixture, mock_command_groups_par_success: list[CommandGroup]) -> None:
-    mocker.patch("par_run.cli.read_commands_toml", return_value=mock_command_groups_par_success)
-    mocker.patch("par_run.cli.rich.print")
-    result = runner.invoke(cli_app, ["run", "--show"])
-    assert result.exit_code == 0
+@pytest.fixture(autouse=True)
+def cli_output(mocker: MockerFixture) -> SimpleNamespace:
+    """Silence CLI output for every test; assert through the returned mocks."""
+    return SimpleNamespace(
+        rich_print=mocker.patch("par_run.cli._console.print"),
+        echo=mocker.patch("par_run.cli.typer.echo"),
+    )
+
+
+@pytest.fixture()
+def run_direct(
+    mocker: MockerFixture,
+    mock_command_groups_par_success: list[CommandGroup],
+) -> Callable[..., None]:
+    """Call the run command function directly, bypassing Click argv parsing."""
+    mocker.patch("par_run.cli.read_commands_toml", return_value=copy.deepcopy(mock_command_groups_par_success))
+    return functools.partial(
+        run,
+        style=ProcessingStrategy.ON_COMP,
+        file=Path("pyproject.toml"),
+        backend=AsyncBackend.ASYNCIO,
+    )
 
 
 @pytest.mark.anyio()
-async def test_on_start(mocker: MockerFixture) -> None:
-    mock_rich_print = mocker.patch("par_run.cli.rich.print")
+async def test_on_start(cli_output: SimpleNamespace) -> None:
     cb = CLICommandCBOnComp()
     command = Command(name="cmd1", cmd="echo 'Hello'")
     await cb.on_start(command)
-    mock_rich_print.assert_called_once()
+    cli_output.rich_print.assert_called_once()
 
 
 @pytest.mark.anyio()
-async def test_on_recv(mocker: MockerFixture) -> None:
-    mock_rich_print = mocker.patch("par_run.cli.rich.print")
+async def test_on_recv(cli_output: SimpleNamespace) -> None:
     cb = CLICommandCBOnComp()
     command = Command(name="cmd1", cmd="echo 'Hello'")
     await cb.on_recv(command, "Hello, World!")
-    mock_rich_print.assert_called_once_with("Hello, World!")
+    cli_output.rich_print.assert_called_once_with("Hello, World!")
 
 
 @pytest.mark.anyio()
 @pytest.mark.parametrize("status", [CommandStatus.SUCCESS, CommandStatus.FAILURE])
-async def test_on_term(mocker: MockerFixture, status: CommandStatus) -> None:
-    mock_rich_print = mocker.patch("par_run.cli.rich.print")
+async def test_on_term(cli_output: SimpleNamespace, status: CommandStatus) -> None:
     cb = CLICommandCBOnComp()
     command = Command(name="cmd1", cmd="echo 'Hello'")
     command.status = status
     await cb.on_term(command, 0)
-    assert mock_rich_print.called
+    assert cli_output.rich_print.called
 
 
-def test_clean_up(mocker: MockerFixture, tmp_path: Path) -> None:
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
+def test_clean_up(pid_file: Path) -> None:
     pid_file.write_text("1234")
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
     clean_up()
     assert not pid_file.exists()
 
 
+@pytest.fixture()
+def patched_web(mocker: MockerFixture) -> dict[str, MagicMock]:
+    """Patch all web server entry points in one bundle."""
+    return mocker.patch.multiple(
+        "par_run.cli",
+        start_web_server=mocker.DEFAULT,
+        stop_web_server=mocker.DEFAULT,
+        get_web_server_status=mocker.DEFAULT,
+    )
+
+
 @pytest.mark.parametrize("command", ["start", "stop", "restart", "status"])
-def test_web(mocker: MockerFixture, command: str) -> None:
-    mocker.patch("par_run.cli.start_web_server")
-    mocker.patch("par_run.cli.stop_web_server")
-    mocker.patch("par_run.cli.get_web_server_status")
-    result = runner.invoke(cli_app, ["web", command])
+def test_web(patched_web: dict[str, MagicMock], command: str) -> None:  # noqa: ARG001
+    result = runner.invoke(cli_app, ["web", command], catch_exceptions=False)
     assert result.exit_code == 0
 
 
-def test_web_fail(mocker: MockerFixture) -> None:
-    mocker.patch("par_run.cli.start_web_server")
-    mocker.patch("par_run.cli.stop_web_server")
-    mocker.patch("par_run.cli.get_web_server_status")
+def test_web_fail(patched_web: dict[str, MagicMock]) -> None:  # noqa: ARG001
     result = runner.invoke(cli_app, ["web", "NOT_A_CMD"])
     assert result.exit_code != 0
 
 
-def test_start_web_server(mocker: MockerFixture, tmp_path: Path) -> None:
+def test_start_web_server(mocker: MockerFixture, pid_file: Path) -> None:
     mocker.patch("par_run.cli.subprocess.Popen")
     mocker.patch("par_run.cli.os.path.isfile", return_value=False)
     mocker.patch("par_run.cli.time.time_ns", side_effect=[0, 3 * 10**9 + 1])  # Simulate 3 seconds passing
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
     start_web_server(8000)
     assert pid_file.exists()
 
 
-def test_start_web_server_running(mocker: MockerFixture, tmp_path: Path) -> None:
+def test_start_web_server_running(mocker: MockerFixture, cli_output: SimpleNamespace, pid_file: Path) -> None:
     # Setup: Mock subprocess.Popen to simulate the server process
     mock_process = mocker.MagicMock()
     mocker.patch("par_run.cli.subprocess.Popen", return_value=mock_process)
@@ -111,181 +130,184 @@ def test_start_web_server_running(mocker: MockerFixture, tmp_path: Path) -> None
     # Setup: Mock os.path.isfile to simulate the PID file does not exist initially
     mocker.patch("par_run.cli.os.path.isfile", return_value=False)
 
-    # Setup: Mock time.time_ns to control the loop timing, ensuring it doesn't run out of values
+    # Setup: Fake time.time_ns so the wait loop runs exactly two iterations
     start_ns = 1000000
-    time_ns_side_effect = itertools.chain([start_ns, start_ns + 1], itertools.repeat(start_ns + 2 * 10**9))
-    mocker.patch("par_run.cli.time.time_ns", side_effect=time_ns_side_effect)
+    time_ns_calls = [0]
 
-    get_process_port_side_effect = itertools.chain(
-        [None, 8000],
-        itertools.repeat(8000),
-    )  # First call: None, subsequent calls: 8000 (port number)
-    mocker.patch("par_run.cli.get_process_port", side_effect=get_process_port_side_effect)
+    def fake_time_ns() -> int:
+        time_ns_calls[0] += 1
+        return start_ns if time_ns_calls[0] == 1 else start_ns + 2 * 10**9
 
-    # Setup: Mock typer.echo to capture output
-    mock_echo = mocker.patch("par_run.cli.typer.echo")
+    mocker.patch("par_run.cli.time.time_ns", side_effect=fake_time_ns)
 
-    # Setup: Temporary PID file location
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
+    # First call: None, subsequent calls: 8000 (port number)
+    port_calls = [0]
+
+    def fake_get_process_port(_pid: int) -> Optional[int]:
+        port_calls[0] += 1
+        return None if port_calls[0] == 1 else 8000
+
+    mocker.patch("par_run.cli.get_process_port", side_effect=fake_get_process_port)
 
     # Execute: Call the function to test
     start_web_server(8000)
 
     # Verify: Check that the server is detected as running on the correct port
-    mock_echo.assert_any_call("UVicorn server is running on port 8000 in 2000.00 ms.")
+    cli_output.echo.assert_any_call("UVicorn server is running on port 8000 in 2000.00 ms.")
 
     # Cleanup: Ensure PID file is created
     assert pid_file.exists()
 
 
-def test_stop_web_server(mocker: MockerFixture, tmp_path: Path) -> None:
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
+def test_stop_web_server(mocker: MockerFixture, pid_file: Path) -> None:
+    import signal
+
     pid_file.write_text("1234")
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
-    mocker.patch("par_run.cli.os.kill")
+    kill_mock = mocker.patch("par_run.cli.os.kill")
+    mocker.patch("psutil.pid_exists", return_value=False)
     stop_web_server()
+    kill_mock.assert_called_once_with(1234, signal.SIGTERM)
     assert not pid_file.exists()
 
 
-def test_stop_web_server_no_pid_file(mocker: MockerFixture, tmp_path: Path) -> None:
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
+def test_stop_web_server_sigkill_escalation(mocker: MockerFixture, pid_file: Path) -> None:
+    import signal
+
+    pid_file.write_text("1234")
+    kill_mock = mocker.patch("par_run.cli.os.kill")
+    mocker.patch("psutil.pid_exists", return_value=True)
+    mocker.patch("par_run.cli.time.sleep")
+    mocker.patch("par_run.cli.time.monotonic", side_effect=[0.0, 0.5, 2.0])
+    stop_web_server()
+    kill_mock.assert_any_call(1234, signal.SIGKILL)
+    assert not pid_file.exists()
+
+
+def test_stop_web_server_no_pid_file(mocker: MockerFixture, pid_file: Path) -> None:  # noqa: ARG001
     mocker.patch("par_run.cli.os.kill")
     stop_web_server()
 
 
-def test_get_web_server_status(mocker: MockerFixture, tmp_path: Path) -> None:
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
-    mocker.patch("par_run.cli.typer.echo")
+def test_get_web_server_status(mocker: MockerFixture, pid_file: Path) -> None:
+    import psutil
+
     # Test with no PID file
     get_web_server_status()
     pid_file.write_text("1234")
     # Test with PID file but no process
-    mocker.patch("par_run.cli.psutil.pid_exists", return_value=False)
+    mocker.patch("psutil.Process", side_effect=psutil.NoSuchProcess(pid=1234))
     get_web_server_status()
     # Test with PID file and process
-    mocker.patch("par_run.cli.psutil.pid_exists", return_value=True)
+    pid_file.write_text("1234")
+    mocker.patch("psutil.Process")
     mocker.patch("par_run.cli.get_process_port", return_value=8000)
     get_web_server_status()
 
 
-def test_run_with_on_recv(mocker: MockerFixture, mock_command_groups_par_success: list[CommandGroup]) -> None:
-    read_mock = mocker.patch("par_run.cli.read_commands_toml", return_value=mock_command_groups_par_success)
-    mocker.patch("par_run.cli.rich.print")
-    result = runner.invoke(cli_app, ["run", "--style", "recv"])
-    assert result.exit_code == 0
-    read_mock.assert_called_once()
-
-
-def test_run_with_on_comp(mocker: MockerFixture, mock_command_groups_par_success: list[CommandGroup]) -> None:
-    read_mock = mocker.patch("par_run.cli.read_commands_toml", return_value=mock_command_groups_par_success)
-    mocker.patch("par_run.cli.rich.print")
-    result = runner.invoke(cli_app, ["run", "--style", "comp"])
+def test_run_with_on_recv(
+    mocker: MockerFixture,
+    mock_command_groups_par_success: list[CommandGroup],
+    fake_open_process: MagicMock,  # noqa: ARG001
+) -> None:
+    groups = copy.deepcopy(mock_command_groups_par_success)
+    read_mock = mocker.patch("par_run.cli.read_commands_toml", return_value=groups)
+    result = runner.invoke(cli_app, ["run", "--style", "recv"], catch_exceptions=False)
     assert result.exit_code == 0
     read_mock.assert_called_once()
 
 
-@pytest.mark.skip("Not implemented")
-def test_run_with_specific_groups(mocker: MockerFixture, mock_command_groups_par_success: list[CommandGroup]) -> None:
-    read_mock = mocker.patch("par_run.cli.read_commands_toml", return_value=[mock_command_groups_par_success])
-    mocker.patch("par_run.cli.rich.print")
-    result = runner.invoke(cli_app, ["run", "--groups", mock_command_groups_par_success[0].name])
+def test_run_with_on_comp(
+    mocker: MockerFixture,
+    mock_command_groups_par_success: list[CommandGroup],
+    fake_open_process: MagicMock,  # noqa: ARG001
+) -> None:
+    groups = copy.deepcopy(mock_command_groups_par_success)
+    read_mock = mocker.patch("par_run.cli.read_commands_toml", return_value=groups)
+    result = runner.invoke(cli_app, ["run", "--style", "comp"], catch_exceptions=False)
     assert result.exit_code == 0
     read_mock.assert_called_once()
 
 
-def test_run_with_fails(mocker: MockerFixture, mock_command_groups_par_part_fail: list[CommandGroup]) -> None:
-    read_mock = mocker.patch("par_run.cli.read_commands_toml", return_value=[mock_command_groups_par_part_fail])
-    mocker.patch("par_run.cli.rich.print")
-    result = runner.invoke(cli_app, ["run"])
+@pytest.mark.parametrize(
+    ("show", "groups", "cmds"),
+    [
+        (True, None, None),
+        (False, "test_group0", None),
+        (False, None, "test_0"),
+        (False, "nonexistent", None),
+        (False, None, "nonexistent"),
+    ],
+    ids=["show", "specific_groups", "specific_cmds", "nonexistent_group", "nonexistent_cmd"],
+)
+def test_run_variants(
+    run_direct: Callable[..., None],
+    fake_open_process: MagicMock,  # noqa: ARG001
+    *,
+    show: bool,
+    groups: Optional[str],
+    cmds: Optional[str],
+) -> None:
+    if show:
+        assert run_direct(show=True, groups=groups, cmds=cmds) is None
+        return
+    with pytest.raises(typer.Exit) as excinfo:
+        run_direct(show=False, groups=groups, cmds=cmds)
+    assert excinfo.value.exit_code == 0
+
+
+def test_run_with_fails(
+    mocker: MockerFixture,
+    mock_command_groups_par_part_fail: list[CommandGroup],
+    fake_open_process: MagicMock,  # noqa: ARG001
+) -> None:
+    groups = copy.deepcopy(mock_command_groups_par_part_fail)
+    read_mock = mocker.patch("par_run.cli.read_commands_toml", return_value=groups)
+    result = runner.invoke(cli_app, ["run"], catch_exceptions=False)
     assert result.exit_code != 0
     read_mock.assert_called_once()
 
 
-@pytest.mark.skip("Not implemented")
-def test_run_with_specific_cmds(mocker: MockerFixture, mock_command_groups_par_success: list[CommandGroup]) -> None:
-    mocker.patch("par_run.cli.read_commands_toml", return_value=[mock_command_groups_par_success])
-    mocker.patch("par_run.cli.rich.print")
-    result = runner.invoke(cli_app, ["run", "--cmds", mock_command_groups_par_success[0].cmds[0].name])
-    assert result.exit_code == 0
-    # Add additional assertions to check if the command was filtered correctly
-
-
-@pytest.mark.skip("Not implemented")
-def test_run_with_nonexistent_group(mocker: MockerFixture, mock_command_groups_par_success: list[CommandGroup]) -> None:
-    mocker.patch("par_run.cli.read_commands_toml", return_value=[mock_command_groups_par_success])
-    mocker.patch("par_run.cli.rich.print")
-    result = runner.invoke(cli_app, ["run", "--groups", "nonexistent"])
-    assert result.exit_code == 0
-    # Add assertion to ensure no commands are run and appropriate message is displayed
-
-
-@pytest.mark.skip("Not implemented")
-def test_run_with_nonexistent_cmd(mocker: MockerFixture, mock_command_groups_par_success: list[CommandGroup]) -> None:
-    mocker.patch("par_run.cli.read_commands_toml", return_value=[mock_command_groups_par_success])
-    mocker.patch("par_run.cli.rich.print")
-    result = runner.invoke(cli_app, ["run", "--cmds", "nonexistent"])
-    assert result.exit_code == 0
-    # Add assertion to ensure no commands are run and appropriate message is displayed
-
-
-def test_start_web_server_already_running(mocker: MockerFixture, tmp_path: Path) -> None:
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
+def test_start_web_server_already_running(pid_file: Path) -> None:
     pid_file.write_text("1234")
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
-    mocker.patch("par_run.cli.typer.echo")
     with pytest.raises(SystemExit):
         start_web_server(8000)
 
 
-def test_get_web_server_status_running(mocker: MockerFixture, tmp_path: Path) -> None:
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
+def test_get_web_server_status_running(mocker: MockerFixture, pid_file: Path) -> None:
     pid_file.write_text("1234")
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
-    mocker.patch("par_run.cli.psutil.pid_exists", return_value=True)
+    mocker.patch("psutil.Process")
     mocker.patch("par_run.cli.get_process_port", return_value=8000)
-    mocker.patch("par_run.cli.typer.echo")
     get_web_server_status()
     # Add assertion to check the status message for a running server
 
 
-def test_get_web_server_status_not_running_pid_file_exists(mocker: MockerFixture, tmp_path: Path) -> None:
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
+def test_get_web_server_status_not_running_pid_file_exists(mocker: MockerFixture, pid_file: Path) -> None:
+    import psutil
+
     pid_file.write_text("1234")
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
-    mocker.patch("par_run.cli.psutil.pid_exists", return_value=False)
-    mocker.patch("par_run.cli.typer.echo")
+    mocker.patch("psutil.Process", side_effect=psutil.NoSuchProcess(pid=1234))
     get_web_server_status()
     # Add assertion to check the status message and cleanup action when the server is not running but PID file exists
 
 
-def test_start_web_server_failure_to_start(mocker: MockerFixture, tmp_path: Path) -> None:
+def test_start_web_server_failure_to_start(mocker: MockerFixture, pid_file: Path) -> None:  # noqa: ARG001
     mocker.patch("par_run.cli.subprocess.Popen", side_effect=Exception("Failed to start"))
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
-    mocker.patch("par_run.cli.typer.echo")
     with pytest.raises(Exception, match="Failed to start"):
         start_web_server(8000)
 
 
-def test_stop_web_server_failure(mocker: MockerFixture, tmp_path: Path) -> None:
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
+def test_stop_web_server_failure(mocker: MockerFixture, pid_file: Path) -> None:
     pid_file.write_text("1234")
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
     mocker.patch("par_run.cli.os.kill", side_effect=Exception("Failed to kill"))
-    mocker.patch("par_run.cli.typer.echo")
     with pytest.raises(Exception, match="Failed to kill"):
         stop_web_server()
 
 
 def test_get_process_port(mocker: MockerFixture) -> None:
     # Mock psutil.Process and its connections method
-    mock_process = mocker.patch("par_run.cli.psutil.Process")
-    mock_conn = mocker.MagicMock()
+    mock_process = mocker.patch("psutil.Process")
     run_port = 8000
-    mock_conn.laddr.port = run_port
+    mock_conn = SimpleNamespace(laddr=SimpleNamespace(port=run_port))
     mock_process.return_value.connections.return_value = [mock_conn]
 
     example_pid = 1234
@@ -295,96 +317,89 @@ def test_get_process_port(mocker: MockerFixture) -> None:
 
 def test_get_process_port_no_connections(mocker: MockerFixture) -> None:
     # Mock psutil.Process to return no connections
-    mock_process = mocker.patch("par_run.cli.psutil.Process")
+    mock_process = mocker.patch("psutil.Process")
     mock_process.return_value.connections.return_value = []
 
     port = get_process_port(1234)  # Example PID
     assert port is None
 
 
-def test_list_uvicorn_processes(mocker: MockerFixture) -> None:
-    # Mock psutil.process_iter to yield mock processes
-    mock_process_iter = mocker.patch("par_run.cli.psutil.process_iter")
-    mock_process_uvicorn = mocker.MagicMock()
-    mock_process_uvicorn.name.return_value = "uvicorn"
-    mock_process_uvicorn.pid = 1234
-    mock_process_other = mocker.MagicMock()
-    mock_process_other.name.return_value = "other_process"
+def test_list_uvicorn_processes(mocker: MockerFixture, cli_output: SimpleNamespace) -> None:
+    # Mock psutil.process_iter to yield lightweight process stand-ins
+    mock_process_iter = mocker.patch("psutil.process_iter")
+    mock_process_uvicorn = SimpleNamespace(info={"pid": 1234, "name": "uvicorn"})
+    mock_process_other = SimpleNamespace(info={"pid": 4321, "name": "other_process"})
     mock_process_iter.return_value = [mock_process_uvicorn, mock_process_other]
 
-    mock_echo = mocker.patch("par_run.cli.typer.echo")
-
     list_uvicorn_processes()
 
     # Directly assert the calls made to typer.echo
-    mock_echo.assert_any_call("Other UVicorn processes:")
-    mock_echo.assert_any_call("PID: 1234, Name: uvicorn")
+    cli_output.echo.assert_any_call("Other UVicorn processes:")
+    cli_output.echo.assert_any_call("PID: 1234, Name: uvicorn")
 
 
-def test_list_no_uvicorn_processes(mocker: MockerFixture) -> None:
+def test_list_no_uvicorn_processes(mocker: MockerFixture, cli_output: SimpleNamespace) -> None:
     # Mock psutil.process_iter to yield no UVicorn processes
-    mock_process_iter = mocker.patch("par_run.cli.psutil.process_iter")
-    mock_process_other = mocker.MagicMock()
-    mock_process_other.name.return_value = "other_process"
+    mock_process_iter = mocker.patch("psutil.process_iter")
+    mock_process_other = SimpleNamespace(info={"pid": 4321, "name": "other_process"})
     mock_process_iter.return_value = [mock_process_other]
 
-    mock_echo = mocker.patch("par_run.cli.typer.echo")
-
     list_uvicorn_processes()
 
     # Directly assert the calls made to typer.echo
-    mock_echo.assert_any_call("No other UVicorn processes found.")
+    cli_output.echo.assert_any_call("No other UVicorn processes found.")
 
 
-def test_list_uvicorn_processes_with_exceptions(mocker: MockerFixture) -> None:
+def test_list_uvicorn_processes_with_exceptions(mocker: MockerFixture, cli_output: SimpleNamespace) -> None:
+    # psutil is only needed here for its exception types; import lazily so
+    # collection doesn't pay for loading its C extension
+    import psutil
+
     # Mock psutil.process_iter to yield processes that raise exceptions
-    mock_process_iter = mocker.patch("par_run.cli.psutil.process_iter")
+    mock_process_iter = mocker.patch("psutil.process_iter")
 
-    # Create mock processes that raise the exceptions when name() is called
-    mock_process_no_such_process = mocker.MagicMock()
-    mock_process_no_such_process.name.side_effect = psutil.NoSuchProcess(pid=123)
+    class RaisingProc:
+        """Process stand-in whose info access raises like a vanished process."""
 
-    mock_process_access_denied = mocker.MagicMock()
-    mock_process_access_denied.name.side_effect = psutil.AccessDenied(pid=456)
+        def __init__(self, exc: Exception) -> None:
+            self._exc = exc
 
-    mock_process_zombie_process = mocker.MagicMock()
-    mock_process_zombie_process.name.side_effect = psutil.ZombieProcess(pid=789)
+        @property
+        def info(self) -> dict:
+            raise self._exc
 
     mock_process_iter.return_value = [
-        mock_process_no_such_process,
-        mock_process_access_denied,
-        mock_process_zombie_process,
+        RaisingProc(psutil.NoSuchProcess(pid=123)),
+        RaisingProc(psutil.AccessDenied(pid=456)),
+        RaisingProc(psutil.ZombieProcess(pid=789)),
     ]
 
-    # Mock typer.echo to capture output
-    mock_echo = mocker.patch("par_run.cli.typer.echo")
-
     list_uvicorn_processes()
 
     # Since all processes raise exceptions, the output should indicate no UVicorn processes found
-    mock_echo.assert_any_call("No other UVicorn processes found.")
+    cli_output.echo.assert_any_call("No other UVicorn processes found.")
 
 
-def test_get_web_server_status_running_no_port(mocker: MockerFixture, tmp_path: Path) -> None:
+def test_get_web_server_status_running_no_port(
+    mocker: MockerFixture,
+    cli_output: SimpleNamespace,
+    pid_file: Path,
+) -> None:
     # Setup: Create a temporary PID file with a mock PID
-    pid_file = tmp_path / ".par-run.uvicorn.pid"
     pid_file.write_text("1234")  # Example PID
-    mocker.patch("par_run.cli.PID_FILE", str(pid_file))
 
-    # Mock psutil.pid_exists to return True, indicating the process exists
-    mocker.patch("par_run.cli.psutil.pid_exists", return_value=True)
+    # Mock psutil.Process so the process appears to exist
+    mocker.patch("psutil.Process")
 
     # Mock get_process_port to return None, simulating an inability to determine the port
     mocker.patch("par_run.cli.get_process_port", return_value=None)
 
     # Mock typer.echo to capture output
-    mock_echo = mocker.patch("par_run.cli.typer.echo")
-
     # Execute: Call the function to test
     get_web_server_status()
 
     # Verify: Check that the appropriate message is output when the port cannot be determined
-    mock_echo.assert_any_call("UVicorn server is running with pid=1234, couldn't determine port.")
+    cli_output.echo.assert_any_call("UVicorn server is running with pid=1234, couldn't determine port.")
 
 
 def test_enums() -> None:
@@ -396,8 +411,7 @@ def test_enums() -> None:
         assert str(backend) == backend.value
 
 @pytest.mark.anyio()
-async def test_command_cb_comp_success(mocker: MockerFixture) -> None:
-    mocker.patch("par_run.cli.rich.print")
+async def test_command_cb_comp_success() -> None:
     cb = CLICommandCBOnComp()
     command = Command(name="cmd1", cmd="echo 'Hello'")
     await cb.on_start(command)
@@ -407,8 +421,7 @@ async def test_command_cb_comp_success(mocker: MockerFixture) -> None:
 
 
 @pytest.mark.anyio()
-async def test_command_cb_comp_fail(mocker: MockerFixture) -> None:
-    mocker.patch("par_run.cli.rich.print")
+async def test_command_cb_comp_fail() -> None:
     cb = CLICommandCBOnComp()
     command = Command(name="cmd1", cmd="echo 'Hello'")
     await cb.on_start(command)
@@ -418,8 +431,7 @@ async def test_command_cb_comp_fail(mocker: MockerFixture) -> None:
 
 
 @pytest.mark.anyio()
-async def test_command_cb_recv_success(mocker: MockerFixture) -> None:
-    mocker.patch("par_run.cli.rich.print")
+async def test_command_cb_recv_success() -> None:
     cb = CLICommandCBOnRecv()
     command = Command(name="cmd1", cmd="echo 'Hello'")
     await cb.on_start(command)
@@ -429,8 +441,7 @@ async def test_command_cb_recv_success(mocker: MockerFixture) -> None:
 
 
 @pytest.mark.anyio()
-async def test_command_cb_recv_fail(mocker: MockerFixture) -> None:
-    mocker.patch("par_run.cli.rich.print")
+async def test_command_cb_recv_fail() -> None:
     cb = CLICommandCBOnRecv()
     command = Command(name="cmd1", cmd="echo 'Hello'")
     await cb.on_start(command)
@@ -456,19 +467,19 @@ def test_results_table() -> None:
 
 def test_fmt_group_name() -> None:
     cmd_name = "group1"
-    cmd_grp = CommandGroup(name=cmd_name, cmds=OrderedDict())
+    cmd_grp = CommandGroup(name=cmd_name, cmds={})
     cmd_grp.status = CommandStatus.SUCCESS
     fmt_res = fmt_group_name(cmd_grp)
     assert cmd_name in fmt_res
     assert "[green]" in fmt_res
 
-    cmd_grp = CommandGroup(name=cmd_name, cmds=OrderedDict())
+    cmd_grp = CommandGroup(name=cmd_name, cmds={})
     cmd_grp.status = CommandStatus.FAILURE
     fmt_res = fmt_group_name(cmd_grp)
     assert cmd_name in fmt_res
     assert "[red]" in fmt_res
 
-    cmd_grp = CommandGroup(name=cmd_name, cmds=OrderedDict())
+    cmd_grp = CommandGroup(name=cmd_name, cmds={})
     cmd_grp.status = CommandStatus.NOT_STARTED
     fmt_res = fmt_group_name(cmd_grp)
     assert cmd_name in fmt_res
@@ -504,9 +515,10 @@ def test_add_command_row_colours() -> None:
 
 
 def test_filter_groups(mock_command_groups_par_success: list[CommandGroup]) -> None:
-    filtered = filter_groups(mock_command_groups_par_success, "test_group0", None)
+    groups = copy.deepcopy(mock_command_groups_par_success)
+    filtered = filter_groups(groups, "test_group0", None)
     assert len(filtered) == 1
-    filtered = filter_groups(mock_command_groups_par_success, None, "test_0")
+    filtered = filter_groups(groups, None, "test_0")
     assert all(len(group.cmds) == 1 for group in filtered)
 
 
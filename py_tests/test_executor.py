@@ -1,7 +1,7 @@
-from collections import OrderedDict
+import asyncio
+import copy
 from pathlib import Path
 
-import anyio
 import pytest
 import tomlkit
 
@@ -17,23 +17,34 @@ from par_run.executor import (
 from par_run.executor import (
     internal_error_ret_code as internal_err_ret_code,
 )
-from py_tests.conftest import AnyIOBackendT
+from py_tests.conftest import (
+    _ALL_GROUPS,
+    _PAR_PART_FAIL_PARAMS,
+    _PAR_SUCCESS_PARAMS,
+    _SERIAL_SUCCESS_PARAMS,
+    AnyIOBackendT,
+    assert_group_success,
+    cmd_group_ids,
+)
+
+# Keep the subprocess-heavy tests on one xdist worker so fork pressure stays bounded
+pytestmark = pytest.mark.xdist_group("executor_subproc")
 
 
 class CommanCBTest:
-    def __init__(self) -> None:
-        self.output = []
-        self.exit_code = 0
+    """Assertion-only callbacks; stateless so one instance serves the whole session."""
 
     async def on_start(self, cmd: Command) -> None:
         assert cmd
         assert cmd.name.startswith("test")
 
-    async def on_recv(self, cmd: Command, output: str) -> None:
-        assert cmd
-        assert cmd.name.startswith("test")
+    async def on_recv(self, cmd: Command, output: str) -> None:  # noqa: ARG002
+        # Command invariants are checked once in on_start/on_term; this runs per line
         assert output is not None
-        self.output.append(output)
+
+    async def on_recv_batch(self, cmd: Command, lines: list[str]) -> None:  # noqa: ARG002
+        assert lines
+        assert all(line is not None for line in lines)
 
     async def on_term(self, cmd: Command, exit_code: int) -> None:
         assert cmd
@@ -47,7 +58,11 @@ class CommanCBTest:
         elif cmd.status == CommandStatus.FAILURE:
             assert cmd.status.completed()
             assert cmd.ret_code != 0
-        self.exit_code = exit_code
+
+
+@pytest.fixture(scope="session")
+def executor_cb() -> CommanCBTest:
+    return CommanCBTest()
 
 
 def test_command_set_running() -> None:
@@ -58,61 +73,42 @@ def test_command_set_running() -> None:
     assert command.status == CommandStatus.RUNNING  # type: ignore
 
 
+@pytest.mark.anyio()
 @pytest.mark.parametrize("style", [ProcessingStrategy.ON_COMP, ProcessingStrategy.ON_RECV])
-def test_command_group_parallel(
+@pytest.mark.parametrize("params", _PAR_SUCCESS_PARAMS + _SERIAL_SUCCESS_PARAMS, ids=cmd_group_ids)
+async def test_command_group_success(
     anyio_backend: AnyIOBackendT,  # noqa: ARG001
-    mock_command_groups_par_success: list[CommandGroup],
+    executor_cb: CommanCBTest,
+    params: tuple,
     style: ProcessingStrategy,
 ) -> None:
-    for group in mock_command_groups_par_success:
-        cb = CommanCBTest()
-        anyio.run(group.run, style, cb)
-        assert all(cmd.status.completed() for cmd in group.cmds.values())
-        assert all(cmd.ret_code == 0 for cmd in group.cmds.values())
-        assert all(cmd.num_non_empty_lines == cmd.cmd.count("echo") for cmd in group.cmds.values())
-        assert all(cmd.unflushed == [] for cmd in group.cmds.values())
-        assert all(cmd.status == CommandStatus.SUCCESS for cmd in group.cmds.values())
-        assert all(cmd.ret_code == 0 for cmd in group.cmds.values())
+    for group in copy.deepcopy(_ALL_GROUPS[params]):
+        await group.run(style, executor_cb)
+        assert_group_success(group)
 
 
+@pytest.mark.anyio()
 @pytest.mark.parametrize("style", [ProcessingStrategy.ON_COMP, ProcessingStrategy.ON_RECV])
-def test_command_group_serial(
+@pytest.mark.parametrize("params", _PAR_PART_FAIL_PARAMS, ids=cmd_group_ids)
+async def test_command_group_part_fail(
     anyio_backend: AnyIOBackendT,  # noqa: ARG001
-    mock_command_groups_serial_success: list[CommandGroup],
+    executor_cb: CommanCBTest,
+    params: tuple,
     style: ProcessingStrategy,
 ) -> None:
-    for group in mock_command_groups_serial_success:
-        cb = CommanCBTest()
-        anyio.run(group.run, style, cb)
-        assert all(cmd.status.completed() for cmd in group.cmds.values())
-        assert all(cmd.ret_code == 0 for cmd in group.cmds.values())
-        assert all(cmd.num_non_empty_lines == cmd.cmd.count("echo") for cmd in group.cmds.values())
-        assert all(cmd.unflushed == [] for cmd in group.cmds.values())
-        assert all(cmd.status == CommandStatus.SUCCESS for cmd in group.cmds.values())
-        assert all(cmd.ret_code == 0 for cmd in group.cmds.values())
-
-
-@pytest.mark.parametrize("style", [ProcessingStrategy.ON_COMP, ProcessingStrategy.ON_RECV])
-def test_command_group_serial_part_fail(
-    anyio_backend: AnyIOBackendT,  # noqa: ARG001
-    mock_command_groups_par_part_fail: list[CommandGroup],
-    style: ProcessingStrategy,
-) -> None:
-    for group in mock_command_groups_par_part_fail:
-        cb = CommanCBTest()
-
-        anyio.run(group.run, style, cb)
+    for group in copy.deepcopy(_ALL_GROUPS[params]):
+        await group.run(style, executor_cb)
         assert all(cmd.status.completed() for cmd in group.cmds.values())
 
         fail_ix = -1
         for ix, cmd in enumerate(group.cmds.values()):
             if cmd.status == CommandStatus.SUCCESS:
                 assert cmd.ret_code == 0
-                assert cmd.num_non_empty_lines == cmd.cmd.count("echo")
+                assert cmd.num_non_empty_lines == cmd.cmd.count("printf")
             elif cmd.status == CommandStatus.FAILURE:
                 fail_ix = ix
                 assert cmd.ret_code != 0
-                assert cmd.num_non_empty_lines == cmd.cmd.count("echo")
+                assert cmd.num_non_empty_lines == cmd.cmd.count("printf")
             else:
                 assert ix > fail_ix
                 assert cmd.ret_code == internal_err_ret_code
@@ -121,75 +117,35 @@ def test_command_group_serial_part_fail(
         assert all(cmd.unflushed == [] for cmd in group.cmds.values())
 
 
-def test_command_group_timeout_on_recv(anyio_backend_asyncio) -> None:  # noqa: ARG001, ANN001
-    command1 = Command(name="test1", cmd="echo 'Hello, World!' && sleep 2 && exit 0", passenv=["PATH"])
-    commands = OrderedDict()
-    commands[command1.name] = command1
-    group = CommandGroup(name="test_group", cmds=commands, timeout=1)
-    anyio.run(group.run, ProcessingStrategy.ON_RECV, CommanCBTest())
-
-    assert all(cmd.status.completed() for cmd in group.cmds.values())
-    assert all(cmd.ret_code == internal_err_ret_code for cmd in group.cmds.values())
-    assert all(cmd.num_non_empty_lines == 1 for cmd in group.cmds.values())
-    assert all(cmd.unflushed == [] for cmd in group.cmds.values())
-    assert all(cmd.status == CommandStatus.TIMEOUT for cmd in group.cmds.values())
-
-
-def test_command_group_timeout_on_comp(anyio_backend_asyncio) -> None:  # noqa: ARG001, ANN001
-    command1 = Command(name="test1", cmd="echo 'Hello, World!' && sleep 2 && exit 0", passenv=["PATH"])
-    commands = OrderedDict()
-    commands[command1.name] = command1
-    group = CommandGroup(name="test_group", cmds=commands, timeout=1)
-    anyio.run(group.run, ProcessingStrategy.ON_COMP, CommanCBTest())
-    timeout_ret_code = 999
-    assert all(cmd.status.completed() for cmd in group.cmds.values())
-    assert all(cmd.ret_code == timeout_ret_code for cmd in group.cmds.values())
-    assert all(cmd.num_non_empty_lines == 1 for cmd in group.cmds.values())
-    assert all(len(cmd.unflushed) > 0 for cmd in group.cmds.values())
-    assert all(cmd.status == CommandStatus.TIMEOUT for cmd in group.cmds.values())
-
-
-@pytest.mark.parametrize("style", [ProcessingStrategy.ON_COMP, ProcessingStrategy.ON_RECV])
-async def test_command_group_async(
+@pytest.mark.anyio()
+async def test_command_group_max_parallel_one(
     anyio_backend: AnyIOBackendT,  # noqa: ARG001
-    mock_command_groups_par_success: list[CommandGroup],
-    style: ProcessingStrategy,
+    executor_cb: CommanCBTest,
 ) -> None:
-    for group in mock_command_groups_par_success:
-        cb = CommanCBTest()
-        await group.run(style, cb)
-        assert all(cmd.status.completed() for cmd in group.cmds.values())
-        assert all(cmd.ret_code == 0 for cmd in group.cmds.values())
-        assert all(cmd.num_non_empty_lines == cmd.cmd.count("echo") for cmd in group.cmds.values())
-        assert all(cmd.unflushed == [] for cmd in group.cmds.values())
-        assert all(cmd.status == CommandStatus.SUCCESS for cmd in group.cmds.values())
-        assert all(cmd.ret_code == 0 for cmd in group.cmds.values())
+    for group in copy.deepcopy(_ALL_GROUPS[(2, 3, 3, False, True)]):
+        group.max_parallel = 1
+        await group.run(ProcessingStrategy.ON_RECV, executor_cb)
+        assert_group_success(group)
 
 
+@pytest.mark.timeout(5)
 @pytest.mark.parametrize("style", [ProcessingStrategy.ON_COMP, ProcessingStrategy.ON_RECV])
-async def test_command_group_async_part_fail(
-    anyio_backend: AnyIOBackendT,  # noqa: ARG001
-    mock_command_groups_par_part_fail: list[CommandGroup],
-    style: ProcessingStrategy,
-) -> None:
-    for group in mock_command_groups_par_part_fail:
-        cb = CommanCBTest()
-        await group.run(style, cb)
-        fail_ix = -1
-        for ix, cmd in enumerate(group.cmds.values()):
-            if cmd.status == CommandStatus.SUCCESS:
-                assert cmd.ret_code == 0
-                assert cmd.num_non_empty_lines == cmd.cmd.count("echo")
-            elif cmd.status == CommandStatus.FAILURE:
-                fail_ix = ix
-                assert cmd.ret_code != 0
-                assert cmd.num_non_empty_lines == cmd.cmd.count("echo")
-            else:
-                assert ix > fail_ix
-                assert cmd.ret_code == internal_err_ret_code
-                assert cmd.num_non_empty_lines == 0
+def test_command_group_timeout(fake_proc, executor_cb: CommanCBTest, style: ProcessingStrategy) -> None:  # noqa: ARG001, ANN001
+    command1 = Command(name="test1", cmd="echo 'Hello, World!' && sleep 2 && exit 0", passenv=["PATH"])
+    commands = {command1.name: command1}
+    group = CommandGroup(name="test_group", cmds=commands, timeout=0.05)
+    asyncio.run(group.run(style, executor_cb))
 
+    assert all(cmd.status.completed() for cmd in group.cmds.values())
+    assert all(cmd.ret_code == internal_err_ret_code for cmd in group.cmds.values())
+    assert all(cmd.num_non_empty_lines == 1 for cmd in group.cmds.values())
+    assert all(cmd.status == CommandStatus.TIMEOUT for cmd in group.cmds.values())
+    if style == ProcessingStrategy.ON_RECV:
+        # ON_RECV flushes each line as it arrives
         assert all(cmd.unflushed == [] for cmd in group.cmds.values())
+    else:
+        # ON_COMP buffers lines that never get flushed once the timeout fires
+        assert all(len(cmd.unflushed) > 0 for cmd in group.cmds.values())
 
 
 def test_validate_mandatory_keys() -> None:
@@ -247,17 +203,16 @@ def test__get_optional_keys() -> None:
     assert _get_optional_keys(data, keys) == expected_result5
 
 
-@pytest.mark.parametrize("filename", ["pyproject.toml", "commands.toml"])
-def test_read_commands_toml(filename: str) -> None:
-    command_groups = read_commands_toml(filename)
+def test_read_commands_toml(parsed_command_groups: tuple[str, list[CommandGroup]]) -> None:
+    _filename, command_groups = parsed_command_groups
     assert isinstance(command_groups, list)
     assert len(command_groups) > 0
     for group in command_groups:
         assert isinstance(group, CommandGroup)
         assert group.name
         assert isinstance(group.desc, str) or group.desc is None
-        assert isinstance(group.cmds, OrderedDict)
-        assert isinstance(group.timeout, int)
+        assert isinstance(group.cmds, dict)
+        assert isinstance(group.timeout, float)
         assert isinstance(group.cont_on_fail, bool)
         assert isinstance(group.serial, bool)
 
@@ -266,10 +221,10 @@ def test_read_commands_toml(filename: str) -> None:
             assert cmd.name == cmd_name
             assert cmd.cmd
 
-    # Test case 2: Invalid commands.toml file
-    filename = "invalid_commands.toml"
+
+def test_read_commands_toml_missing_file() -> None:
     with pytest.raises(FileNotFoundError):
-        read_commands_toml(filename)
+        read_commands_toml("invalid_commands.toml")
 
 
 def test_read_commands_toml_missing_section(tmp_path: Path) -> None:
@@ -299,6 +254,7 @@ desc = "Code formatting commands."
 cont_on_fail = true # default is false
 serial = false # default is false
 timeout = 5
+max_parallel = 2
 
   [[tool.par-run.groups.commands]]
   name = "ruff_fmt"
@@ -333,15 +289,19 @@ timeout = 10
     group_1_timeout = 5
     group_2_timeout = 10
 
+    group_1_max_parallel = 2
+
     groups = read_commands_toml(toml_file)
     assert len(groups) == num_groups
     assert groups[0].name == "Formatting"
     assert groups[0].timeout == group_1_timeout
     assert groups[0].serial is False
+    assert groups[0].max_parallel == group_1_max_parallel
 
     assert groups[1].name == "Formatting2"
     assert groups[1].timeout == group_2_timeout
     assert groups[1].serial
+    assert groups[1].max_parallel is None
 
 
 def test_read_commands_toml_non_pyproj(tmp_path: Path) -> None:
@@ -1,14 +1,16 @@
-from collections import OrderedDict
+import json
 from collections.abc import Generator
+from typing import Callable
 
 import pytest
 import requests
 from fastapi.testclient import TestClient
+from fastapi.websockets import WebSocketState
 from httpx import AsyncClient
 from pytest_mock import MockerFixture
 
-from par_run.executor import Command, CommandGroup
-from par_run.web import ws_app
+from par_run.executor import Command, CommandGroup, CommandStatus
+from par_run.web import WebCommandCB, websocket_endpoint, ws_app
 
 from .conftest import AnyIOBackendT
 
@@ -23,6 +25,22 @@ def async_client() -> Generator[AsyncClient, None, None]:
     return AsyncClient(app=ws_app, base_url="http://test")
 
 
+@pytest.fixture()
+def make_ws_groups() -> Callable[..., list[CommandGroup]]:
+    """Factory for the two-command group used by the websocket tests."""
+
+    def _make(*, fail: bool = False) -> list[CommandGroup]:
+        command1 = Command(name="test1", cmd="printf 'Hello, World!\\n'")
+        command2 = Command(
+            name="test2",
+            cmd="printf 'World, Hey!\\n' && exit 1" if fail else "printf 'World, Hey!\\n'",
+        )
+        commands = {command1.name: command1, command2.name: command2}
+        return [CommandGroup(name="test_group", cmds=commands)]
+
+    return _make
+
+
 def test_ws_main() -> None:
     client = TestClient(ws_app)
     response = client.get("/")
@@ -30,37 +48,95 @@ def test_ws_main() -> None:
     assert response.status_code == http_ok
 
 
-def test_ws_full(test_client: TestClient, mocker: MockerFixture, anyio_backend: AnyIOBackendT) -> None:  # noqa: ARG001
-    command1 = Command(name="test1", cmd="echo 'Hello, World!'")
-    command2 = Command(name="test2", cmd="echo 'World, Hey!'")
-    commands = OrderedDict()
-    commands[command1.name] = command1
-    commands[command2.name] = command2
-    groups = [CommandGroup(name="test_group", cmds=commands)]
-
-    mocker.patch("par_run.web.read_commands_toml", return_value=groups)
+def test_ws_full(
+    test_client: TestClient,
+    mocker: MockerFixture,
+    make_ws_groups: Callable[..., list[CommandGroup]],
+    anyio_backend: AnyIOBackendT,  # noqa: ARG001
+) -> None:
+    mocker.patch("par_run.web.read_commands_toml", return_value=make_ws_groups())
 
     with test_client.websocket_connect("/ws") as ws:
         _res = ws.receive_json()
         assert _res
 
 
-def test_ws_full_part_fail(test_client: TestClient, mocker: MockerFixture, anyio_backend: AnyIOBackendT) -> None:  # noqa: ARG001
-    command1 = Command(name="test1", cmd="echo 'Hello, World!'")
-    command2 = Command(name="test2", cmd="echo 'World, Hey!' && exit 1")
-    commands = OrderedDict()
-    commands[command1.name] = command1
-    commands[command2.name] = command2
-    groups = [CommandGroup(name="test_group", cmds=commands)]
-
-    mocker.patch("par_run.web.read_commands_toml", return_value=groups)
+def test_ws_full_part_fail(
+    test_client: TestClient,
+    mocker: MockerFixture,
+    make_ws_groups: Callable[..., list[CommandGroup]],
+    anyio_backend: AnyIOBackendT,  # noqa: ARG001
+) -> None:
+    mocker.patch("par_run.web.read_commands_toml", return_value=make_ws_groups(fail=True))
 
     with test_client.websocket_connect("/ws") as ws:
         _res = ws.receive_json()
         assert _res
 
 
-async def test_get_cfg(test_client: TestClient) -> None:
+@pytest.mark.anyio()
+async def test_ws_disconnect_aborts_remaining_groups(
+    mocker: MockerFixture,
+    make_ws_groups: Callable[..., list[CommandGroup]],
+) -> None:
+    group1 = make_ws_groups()[0]
+    group2 = group1.model_copy(deep=True)
+    group2.name = "test_group2"
+    mocker.patch("par_run.web.read_commands_toml", return_value=[group1, group2])
+
+    ws = mocker.AsyncMock()
+    ws.client_state = WebSocketState.DISCONNECTED
+    await websocket_endpoint(ws)
+
+    # The first group finishes its in-flight run; the dead socket stops the second
+    assert all(cmd.status.completed() for cmd in group1.cmds.values())
+    assert all(cmd.status == CommandStatus.NOT_STARTED for cmd in group2.cmds.values())
+
+
+@pytest.mark.anyio()
+async def test_webcommandcb_on_recv_buffers_until_threshold(mocker: MockerFixture) -> None:
+    ws = mocker.AsyncMock()
+    cb = WebCommandCB(ws)
+    command = Command(name="test1", cmd="printf 'Hello, World!\\n'")
+
+    for ix in range(cb.flush_threshold - 1):
+        await cb.on_recv(command, f"line {ix}")
+    ws.send_json.assert_not_called()
+
+    await cb.on_recv(command, "last line")
+    ws.send_json.assert_called_once()
+    payload = ws.send_json.call_args.args[0]
+    assert payload["commandName"] == command.name
+    assert payload["output"].split("\n") == [f"line {ix}" for ix in range(cb.flush_threshold - 1)] + ["last line"]
+
+
+@pytest.mark.anyio()
+async def test_webcommandcb_on_recv_batch_flushes_per_chunk(mocker: MockerFixture) -> None:
+    ws = mocker.AsyncMock()
+    cb = WebCommandCB(ws)
+    command = Command(name="test1", cmd="printf 'Hello, World!\\n'")
+
+    # Each chunk goes out immediately, even well below the per-line threshold
+    await cb.on_recv_batch(command, ["Hello, World!", "World, Hey!"])
+    ws.send_json.assert_called_once_with({"commandName": command.name, "output": "Hello, World!\nWorld, Hey!"})
+
+
+@pytest.mark.anyio()
+async def test_webcommandcb_on_term_flushes_then_reports(mocker: MockerFixture) -> None:
+    ws = mocker.AsyncMock()
+    cb = WebCommandCB(ws)
+    command = Command(name="test1", cmd="printf 'Hello, World!\\n'")
+    command.status = CommandStatus.SUCCESS
+
+    await cb.on_recv(command, "tail line")
+    await cb.on_term(command, 0)
+
+    ws.send_json.assert_called_once_with({"commandName": command.name, "output": "tail line"})
+    ws.send_text.assert_called_once()
+    assert json.loads(ws.send_text.call_args.args[0]) == {"commandName": command.name, "output": {"ret_code": 0}}
+
+
+def test_get_cfg(test_client: TestClient) -> None:
     resp = test_client.get("/get-commands-config")
     assert resp.status_code == requests.codes.ok
     assert resp.json()
@@ -2,9 +2,14 @@
 
 import contextlib
 import enum
-from collections import OrderedDict
+import importlib.util
+import os
+import signal
+import subprocess
+import sys
+import time
 from pathlib import Path
-from typing import Annotated, Any, Optional
+from typing import TYPE_CHECKING, Annotated, Any, Optional, Union
 
 import anyio
 import rich
@@ -12,8 +17,15 @@ import typer
 
 from .executor import Command, CommandGroup, CommandStatus, ProcessingStrategy, read_commands_toml
 
+if TYPE_CHECKING:  # pragma: no cover
+    import psutil
+
 PID_FILE = ".par-run.uvicorn.pid"
 
+# One shared console: per-line callback output skips rich.print's per-call global lookup
+# and the default syntax highlighting pass
+_console = rich.console.Console(highlight=False, soft_wrap=True)
+
 cli_app = typer.Typer()
 
 
@@ -45,6 +57,7 @@ def start_web_server(port: int) -> None:
         # Wait for UVicorn to start
         wait_time = 3 * 10**9  # 3 seconds
         start_time = time.time_ns()
+        poll_interval = 0.005  # Back off exponentially; fast starts are caught in the first polls
 
         while time.time_ns() - start_time < wait_time:
             test_port = get_process_port(process.pid)
@@ -53,7 +66,8 @@ def start_web_server(port: int) -> None:
                 typer.echo(f"UVicorn server is running on port {port} in {elapsed_time:.2f} ms.")
                 typer.echo(f"Server running at http://localhost:{port}/")
                 break
-            time.sleep(0.1)  # Poll every 0.1 seconds
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, 0.1)
 
         else:
             typer.echo(f"UVicorn server did not respond within {wait_time} seconds.")
@@ -62,6 +76,8 @@ def start_web_server(port: int) -> None:
 
 def stop_web_server() -> None:
     """Stop the UVicorn server by reading its PID from the PID file and sending a termination signal."""
+    import psutil
+
     if not Path(PID_FILE).is_file():
         typer.echo("UVicorn server is not running.")
         return
@@ -72,11 +88,27 @@ def stop_web_server() -> None:
     typer.echo(f"Stopping UVicorn server with {pid=:}...")
     with contextlib.suppress(ProcessLookupError):
         os.kill(pid, signal.SIGTERM)
+
+    # Wait for the process to actually exit so an immediate restart does not race
+    # the old server for the port; escalate to SIGKILL if SIGTERM is ignored.
+    poll_interval = 0.005
+    deadline = time.monotonic() + 1.0
+    while psutil.pid_exists(pid) and time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        poll_interval = min(poll_interval * 2, 0.1)
+
+    if psutil.pid_exists(pid):
+        typer.echo(f"UVicorn server with {pid=:} ignored SIGTERM, sending SIGKILL.")
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(pid, signal.SIGKILL)
     clean_up()
 
 
-def get_process_port(pid: int) -> Optional[int]:
-    process = psutil.Process(pid)
+def get_process_port(proc: Union[int, "psutil.Process"]) -> Optional[int]:
+    # psutil loads a C extension; import it only when a web command actually runs
+    import psutil
+
+    process = psutil.Process(proc) if isinstance(proc, int) else proc
     connections = process.connections()
     if connections:
         port = connections[0].laddr.port
@@ -86,23 +118,27 @@ def get_process_port(pid: int) -> Optional[int]:
 
 def list_uvicorn_processes() -> None:
     """Check for other UVicorn processes and list them"""
+    import psutil
+
     uvicorn_processes = []
     with contextlib.suppress(psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-        for process in psutil.process_iter():
-            process_name = process.name()
-            if "uvicorn" in process_name.lower():
-                uvicorn_processes.append(process)
+        # Requesting the attrs up front lets psutil batch the per-pid reads in one pass
+        uvicorn_processes = [
+            process for process in psutil.process_iter(["pid", "name"]) if "uvicorn" in process.info["name"].lower()
+        ]
 
     if uvicorn_processes:
         typer.echo("Other UVicorn processes:")
         for process in uvicorn_processes:
-            typer.echo(f"PID: {process.pid}, Name: {process.name()}")
+            typer.echo(f"PID: {process.info['pid']}, Name: {process.info['name']}")
     else:
         typer.echo("No other UVicorn processes found.")
 
 
 def get_web_server_status() -> None:
     """Get the status of the UVicorn server by reading its PID from the PID file."""
+    import psutil
+
     if not Path(PID_FILE).is_file():
         typer.echo("No pid file found. Server likely not running.")
         list_uvicorn_processes()
@@ -110,15 +146,18 @@ def get_web_server_status() -> None:
 
     with Path(PID_FILE).open() as pid_file:
         pid = int(pid_file.read().strip())
-        if psutil.pid_exists(pid):
-            port = get_process_port(pid)
-            if port:
-                typer.echo(f"UVicorn server is running with {pid=}, {port=}")
-            else:
-                typer.echo(f"UVicorn server is running with {pid=:}, couldn't determine port.")
-        else:
+        try:
+            # One Process handle covers both the liveness check and the port lookup
+            process = psutil.Process(pid)
+        except psutil.NoSuchProcess:
             typer.echo("UVicorn server is not running but pid files exists, deleting it.")
             clean_up()
+            return
+        port = get_process_port(process)
+        if port:
+            typer.echo(f"UVicorn server is running with {pid=}, {port=}")
+        else:
+            typer.echo(f"UVicorn server is running with {pid=:}, couldn't determine port.")
 
 
 class WebCommand(enum.Enum):
@@ -146,32 +185,38 @@ class AsyncBackend(enum.Enum):
 
 class CLICommandCBOnComp:
     async def on_start(self, cmd: Command) -> None:
-        rich.print(f"[blue bold]{cmd.name}: Started[/]")
+        _console.print(f"[blue bold]{cmd.name}: Started[/]")
 
     async def on_recv(self, _: Command, output: str) -> None:
-        rich.print(output)
+        _console.print(output)
+
+    async def on_recv_batch(self, _: Command, lines: list[str]) -> None:
+        _console.print("\n".join(lines))
 
     async def on_term(self, cmd: Command, exit_code: int) -> None:
         """Callback function for when a command receives output"""
         if cmd.status == CommandStatus.SUCCESS:
-            rich.print(f"[green bold]{cmd.name}: Finished[/]")
+            _console.print(f"[green bold]{cmd.name}: Finished[/]")
         elif cmd.status == CommandStatus.FAILURE:
-            rich.print(f"[red bold]{cmd.name}: Failed, {exit_code=:}[/]")
+            _console.print(f"[red bold]{cmd.name}: Failed, {exit_code=:}[/]")
 
 
 class CLICommandCBOnRecv:
     async def on_start(self, cmd: Command) -> None:
-        rich.print(f"[blue bold]{cmd.name}: Started[/]")
+        _console.print(f"[blue bold]{cmd.name}: Started[/]")
 
     async def on_recv(self, cmd: Command, output: str) -> None:
-        rich.print(f"{cmd.name}: {output}")
+        _console.print(f"{cmd.name}: {output}")
+
+    async def on_recv_batch(self, cmd: Command, lines: list[str]) -> None:
+        _console.print("\n".join(f"{cmd.name}: {line}" for line in lines))
 
     async def on_term(self, cmd: Command, exit_code: int) -> None:
         """Callback function for when a command receives output"""
         if cmd.status == CommandStatus.SUCCESS:
-            rich.print(f"[green bold]{cmd.name}: Finished[/]")
+            _console.print(f"[green bold]{cmd.name}: Finished[/]")
         elif cmd.status == CommandStatus.FAILURE:
-            rich.print(f"[red bold]{cmd.name}: Failed, {exit_code=:}[/]")
+            _console.print(f"[red bold]{cmd.name}: Failed, {exit_code=:}[/]")
 
 
 def format_elapsed_time(seconds: float) -> str:
@@ -186,20 +231,19 @@ def format_elapsed_time(seconds: float) -> str:
     str: The formatted time string.
 
     """
-    hours = int(seconds) // 3600
-    minutes = (int(seconds) % 3600) // 60
-    seconds = seconds % 60  # Keeping the fractional part of seconds
+    hours, rem = divmod(int(seconds), 3600)
+    minutes = rem // 60
 
-    # Return formatted string with seconds rounded to 2 d.p.
-    return f"{hours:02}:{minutes:02}:{seconds:06.3f}"
+    # Keep the fractional part of seconds, rounded to 3 d.p.
+    return f"{hours:02}:{minutes:02}:{seconds % 60:06.3f}"
 
 
 def show_commands(groups: list[CommandGroup]) -> None:
     for grp in groups:
-        rich.print(f"[blue bold]Group: {grp.name}[/]")
-        rich.print(f"Params: cont_on_fail={grp.cont_on_fail}, serial={grp.serial}, timeout={grp.timeout}")
+        _console.print(f"[blue bold]Group: {grp.name}[/]")
+        _console.print(f"Params: cont_on_fail={grp.cont_on_fail}, serial={grp.serial}, timeout={grp.timeout}")
         for cmd in grp.cmds.values():
-            rich.print(f"[green bold]{cmd.name}[/]: {cmd.cmd}")
+            _console.print(f"[green bold]{cmd.name}[/]: {cmd.cmd}")
 
 
 def filter_groups(
@@ -208,17 +252,13 @@ def filter_groups(
     filter_cmds: Optional[str],
 ) -> list[CommandGroup]:
     if filter_groups:
-        group_list = [grp for grp in group_list if grp.name in [g.strip() for g in filter_groups.split(",")]]
+        wanted_groups = {g.strip() for g in filter_groups.split(",")}
+        group_list = [grp for grp in group_list if grp.name in wanted_groups]
 
     if filter_cmds:
+        wanted_cmds = {c.strip() for c in filter_cmds.split(",")}
         for grp in group_list:
-            grp.cmds = OrderedDict(
-                {
-                    cmd_name: cmd
-                    for cmd_name, cmd in grp.cmds.items()
-                    if cmd_name in [c.strip() for c in filter_cmds.split(",")]
-                },
-            )
+            grp.cmds = {cmd_name: cmd for cmd_name, cmd in grp.cmds.items() if cmd_name in wanted_cmds}
         group_list = [grp for grp in group_list if grp.cmds]
     return group_list
 
@@ -243,15 +283,15 @@ def build_results_tbl() -> rich.table.Table:
     return res_tbl
 
 
+_STATUS_EMOJI_STYLE = {
+    CommandStatus.SUCCESS: ("✅", "green"),
+    CommandStatus.FAILURE: ("❌", "red"),
+    CommandStatus.TIMEOUT: ("⏰", "orange1"),
+}
+
+
 def command_status_to_emoji(cmd: Command) -> tuple[str, str]:
-    if cmd.status == CommandStatus.SUCCESS:
-        return ("✅", "green")
-    elif cmd.status == CommandStatus.FAILURE:
-        return ("❌", "red")
-    elif cmd.status == CommandStatus.TIMEOUT:
-        return ("⏰", "orange1")
-    else:
-        return ("🚫", "red")
+    return _STATUS_EMOJI_STYLE.get(cmd.status, ("🚫", "red"))
 
 
 def add_command_row(tbl: rich.table.Table, cmd: Command, group_name: str) -> rich.table.Table:
@@ -301,6 +341,15 @@ def run(  # noqa: PLR0913
     actual_backend = backend_options[backend]["backend"]
     actual_backend_opts = backend_options[backend]["backend_options"]
 
+    # The strategy is constant for the whole invocation; resolve it before any work
+    cb_cls: type[Union[CLICommandCBOnComp, CLICommandCBOnRecv]]
+    if style == ProcessingStrategy.ON_COMP:
+        cb_cls = CLICommandCBOnComp
+    elif style == ProcessingStrategy.ON_RECV:
+        cb_cls = CLICommandCBOnRecv
+    else:
+        raise typer.BadParameter("Invalid processing strategy")  # pragma: no cover
+
     master_groups = read_commands_toml(file)
     if show:
         return show_commands(master_groups)
@@ -308,23 +357,16 @@ def run(  # noqa: PLR0913
     master_groups = filter_groups(master_groups, groups, cmds)
 
     if not master_groups:
-        rich.print("[blue]No groups or commands found.[/]")
+        _console.print("[blue]No groups or commands found.[/]")
         raise typer.Exit(0)
 
     for grp in master_groups:
-        # Run the async function with Trio's event loop
-        if style == ProcessingStrategy.ON_COMP:
-            anyio.run(grp.run, style, CLICommandCBOnComp(), backend=actual_backend, backend_options=actual_backend_opts)
-        elif style == ProcessingStrategy.ON_RECV:
-            anyio.run(grp.run, style, CLICommandCBOnRecv(), backend=actual_backend, backend_options=actual_backend_opts)
-        else:
-            raise typer.BadParameter("Invalid processing strategy")  # pragma: no cover
+        anyio.run(grp.run, style, cb_cls(), backend=actual_backend, backend_options=actual_backend_opts)
         if grp.status != CommandStatus.SUCCESS:
             exit_code = 1
             if not grp.cont_on_fail:
                 break
     # Summarise the results
-    console = rich.console.Console()
     res_tbl = build_results_tbl()
 
     for grp_ix, grp in enumerate(master_groups):
@@ -336,27 +378,16 @@ def run(  # noqa: PLR0913
                 grp_name = ""
             add_command_row(res_tbl, cmd, grp_name)
 
-    console.print(res_tbl)
+    _console.print(res_tbl)
     end_style = "[green bold]" if exit_code == 0 else "[red bold]"
-    rich.print(f"\n{end_style}Total elapsed time: {format_elapsed_time(time.perf_counter() - st_all)}[/]")
+    _console.print(f"\n{end_style}Total elapsed time: {format_elapsed_time(time.perf_counter() - st_all)}[/]")
     raise typer.Exit(exit_code)
 
 
-try:
-    import os
-    import signal
-    import subprocess
-    import sys
-    import time
-    from pathlib import Path
-    from typing import Optional
-
-    import psutil
-    import typer
-
-    rich.print("[blue]Web commands loaded[/]")
-
-    PID_FILE = ".par-run.uvicorn.pid"
+# psutil is the web extra's only CLI-side dependency; the functions above import it
+# lazily, so registration only needs to know it is installed, not pay its import cost.
+if importlib.util.find_spec("psutil") is not None:
+    _console.print("[blue]Web commands loaded[/]")
 
     command_default = typer.Argument(..., help="command to control/interract with the web server")
     port_default = typer.Option(8001, help="Port to run the web server")
@@ -379,6 +410,3 @@ try:
         else:
             typer.echo(f"Not a valid command '{command}'", err=True)  # pragma: no cover
             raise typer.Abort()  # pragma: no cover
-
-except ImportError:  # pragma: no cover
-    pass  # pragma: no cover
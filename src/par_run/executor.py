@@ -3,9 +3,10 @@
 import enum
 import os
 import subprocess
+import sys
 import time
-from collections import OrderedDict
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, Mapping
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional, Protocol, Union, cast
 
@@ -14,6 +15,11 @@ import anyio.to_thread
 import tomlkit
 from pydantic import BaseModel, ConfigDict, Field
 
+if sys.version_info >= (3, 11):  # C-implemented parser for the read-only load path
+    import tomllib
+else:  # pragma: no cover
+    tomllib = None
+
 internal_error_ret_code = 999
 
 
@@ -36,7 +42,13 @@ class CommandStatus(enum.Enum):
 
     def completed(self) -> bool:
         """Return True if the command has completed."""
-        return self in [CommandStatus.SUCCESS, CommandStatus.FAILURE, CommandStatus.TIMEOUT, CommandStatus.CANCELLED]
+        return self in _COMPLETED_STATUSES
+
+
+# Built once; completed() is called per command per status check
+_COMPLETED_STATUSES = frozenset(
+    {CommandStatus.SUCCESS, CommandStatus.FAILURE, CommandStatus.TIMEOUT, CommandStatus.CANCELLED},
+)
 
 
 class Command(BaseModel):
@@ -57,8 +69,7 @@ class Command(BaseModel):
 
     def incr_line_count(self, line: str) -> None:
         """Increment the non-empty line count."""
-        if line.strip():
-            self.num_non_empty_lines += 1
+        self.num_non_empty_lines += bool(line.strip())
 
     def append_unflushed(self, line: str) -> None:
         """Append a line to the output and increment the non-empty line count."""
@@ -99,6 +110,7 @@ class Command(BaseModel):
 class CommandCB(Protocol):
     async def on_start(self, cmd: Command) -> None: ...
     async def on_recv(self, cmd: Command, output: str) -> None: ...
+    async def on_recv_batch(self, cmd: Command, lines: list[str]) -> None: ...
     async def on_term(self, cmd: Command, exit_code: int) -> None: ...
 
 
@@ -107,13 +119,14 @@ class CommandGroup(BaseModel):
 
     name: str
     desc: Optional[str] = None
-    cmds: OrderedDict[str, Command] = Field(default_factory=OrderedDict)
-    timeout: int = Field(default=30)
+    cmds: dict[str, Command] = Field(default_factory=dict)
+    timeout: float = Field(default=30)
+    max_parallel: Optional[int] = Field(default=None)
     cont_on_fail: bool = Field(default=False)
     serial: bool = Field(default=False)
     status: CommandStatus = CommandStatus.NOT_STARTED
 
-    def update_status(self, cmds: OrderedDict[str, Command]) -> None:
+    def update_status(self, cmds: dict[str, Command]) -> None:
         """Update the status of the command group."""
         if all(cmd.status == CommandStatus.SUCCESS for cmd in cmds.values()):
             self.status = CommandStatus.SUCCESS
@@ -122,16 +135,15 @@ class CommandGroup(BaseModel):
 
     async def run_serial(self, callbacks: CommandCB) -> None:
         try:
-            for ix in range(len(self.cmds.values())):
-                cmd = list(self.cmds.values())[ix]
+            cmds = list(self.cmds.values())
+            for ix, cmd in enumerate(cmds):
                 cmd.set_running()
                 async with anyio.create_task_group() as nursery:
                     nursery.start_soon(self._run_command, cmd, ProcessingStrategy.ON_RECV, callbacks)
-                if cmd.status != CommandStatus.SUCCESS and not self.cont_on_fail:
+                if cmd.status is not CommandStatus.SUCCESS and not self.cont_on_fail:
                     # Cancel all remaining cmds
-                    for jx in range(ix + 1, len(self.cmds.values())):
-                        cmd = list(self.cmds.values())[jx]
-                        cmd.set_cancelled()
+                    for pending in cmds[ix + 1 :]:
+                        pending.set_cancelled()
                     self.update_status(self.cmds)
                     break
         except Exception as _:  # noqa: BLE001
@@ -141,33 +153,49 @@ class CommandGroup(BaseModel):
 
     async def run_parallel(self, strategy: ProcessingStrategy, callbacks: CommandCB) -> None:
         try:
+            # Cap concurrent launches so large groups don't fork every subprocess at once
+            limiter = anyio.CapacityLimiter(self.max_parallel or os.cpu_count() or 4)
             async with anyio.create_task_group() as nursery:
                 for cmd in self.cmds.values():
-                    nursery.start_soon(self._run_command, cmd, strategy, callbacks)
-                    cmd.set_running()
+                    nursery.start_soon(self._run_command_limited, cmd, strategy, callbacks, limiter)
         except Exception as _:  # noqa: BLE001
             self.status = CommandStatus.FAILURE
         else:
             self.update_status(self.cmds)
 
+    async def _run_command_limited(
+        self,
+        cmd: Command,
+        strategy: ProcessingStrategy,
+        callbacks: CommandCB,
+        limiter: anyio.CapacityLimiter,
+    ) -> int:
+        async with limiter:
+            cmd.set_running()
+            return await self._run_command(cmd, strategy, callbacks)
+
     async def run(self, strategy: ProcessingStrategy, callbacks: CommandCB) -> None:
         if self.serial:
             await self.run_serial(callbacks)
         else:
             await self.run_parallel(strategy, callbacks)
 
-    async def _proces_stdxx_line(
+    async def _proces_stdxx_lines(
         self,
         cmd: Command,
-        line: str,
+        lines: list[str],
         strategy: ProcessingStrategy,
         callbacks: CommandCB,
     ) -> None:
+        if not lines:
+            return
         if strategy == ProcessingStrategy.ON_RECV:
-            await callbacks.on_recv(cmd, line)
+            # One callback per received chunk, not per line
+            await callbacks.on_recv_batch(cmd, lines)
         elif strategy == ProcessingStrategy.ON_COMP:
-            cmd.append_unflushed(line)
-        cmd.incr_line_count(line)
+            cmd.unflushed.extend(lines)
+        for line in lines:
+            cmd.incr_line_count(line)
 
     async def _process_stdxxx(
         self,
@@ -178,32 +206,40 @@ class CommandGroup(BaseModel):
     ) -> None:
         await callbacks.on_start(cmd)
 
-        incomplete_line = ""
+        # Accumulate raw bytes and decode only complete lines, so partial lines
+        # carry over between chunks without re-decoding or intermediate strings
+        buf = bytearray()
 
         async for chunk in stream:
-            # Decode the bytes to a string
-            decoded_chunk = chunk.decode("utf-8")
-            # Combine the remainder of the last chunk with the new chunk
-            lines = (incomplete_line + decoded_chunk).split("\n")
+            buf += chunk
+            nl_ix = buf.rfind(b"\n")
+            if nl_ix < 0:
+                continue  # pragma: no cover
+            complete, buf = buf[:nl_ix], buf[nl_ix + 1 :]
+            lines = complete.decode("utf-8", "replace").split("\n")
 
-            # The last line might be incomplete; hold it back
-            incomplete_line = lines.pop() if lines[-1] else ""
+            await self._proces_stdxx_lines(cmd, lines, strategy, callbacks)
 
-            for line in lines:
-                await self._proces_stdxx_line(cmd, line, strategy, callbacks)
+        if buf:  # pragma: no cover
+            await self._proces_stdxx_lines(cmd, [buf.decode("utf-8", "replace")], strategy, callbacks)
 
-        if incomplete_line:
-            await self._proces_stdxx_line(cmd, incomplete_line, strategy, callbacks)  # pragma: no cover
-
-        if strategy == ProcessingStrategy.ON_COMP:
-            for _ix, line in enumerate(cmd.unflushed):
-                await callbacks.on_recv(cmd, line)
+        if strategy == ProcessingStrategy.ON_COMP and cmd.unflushed:
+            # One flush for the whole command rather than a callback per buffered line
+            await callbacks.on_recv_batch(cmd, cmd.unflushed)
             cmd.clear_unflushed()
 
     async def _run_command(self, cmd: Command, strategy: ProcessingStrategy, callbacks: CommandCB) -> int:
-        env = os.environ.copy()
-        if cmd.setenv:
-            env.update(cmd.setenv)
+        env: Optional[dict[str, str]]
+        if cmd.passenv is not None:
+            # Allow-list: copy only the named parent vars instead of the whole environment
+            env = {key: os.environ[key] for key in cmd.passenv if key in os.environ}
+            if cmd.setenv:
+                env.update(cmd.setenv)
+        elif cmd.setenv:
+            env = {**os.environ, **cmd.setenv}
+        else:
+            # None inherits the parent environment without copying it
+            env = None
 
         # Running the command asynchronously and capturing the output
         try:
@@ -231,35 +267,50 @@ class CommandGroup(BaseModel):
             return exit_code
 
 
-def _validate_mandatory_keys(data: tomlkit.items.Table, keys: list[str], context: str) -> tuple[Any, ...]:
+def _validate_mandatory_keys(data: Mapping[str, Any], keys: list[str], context: str) -> tuple[Any, ...]:
     """Validate that the mandatory keys are present in the data.
 
     Args:
     ----
-        data (tomlkit.items.Table): The data to validate.
+        data (Mapping[str, Any]): The data to validate.
         keys (list[str]): The mandatory keys.
 
     """
-    vals = []
-    for key in keys:
-        val = data.get(key, None)
-        if not val:
-            raise ValueError(f"{key} is mandatory, not found in {context}")
-        vals.append(val)
-    return tuple(vals)
+    get = data.get
+    missing = next((key for key in keys if not get(key, None)), None)
+    if missing:
+        raise ValueError(f"{missing} is mandatory, not found in {context}")
+    return tuple(data[key] for key in keys)
 
 
-def _get_optional_keys(data: tomlkit.items.Table, keys: list[str], default: Any = None) -> tuple[Optional[Any], ...]:  # noqa: ANN001, ANN401
+def _get_optional_keys(data: Mapping[str, Any], keys: list[str], default: Any = None) -> tuple[Optional[Any], ...]:  # noqa: ANN001, ANN401
     """Get Optional keys or default.
 
     Args:
     ----
-        data (tomlkit.items.Table): The data to use as source
+        data (Mapping[str, Any]): The data to use as source
         keys (list[str]): The optional keys.
 
     """
-    res = tuple(data.get(key, default) for key in keys)
-    return res
+    get = data.get
+    return tuple(get(key, default) for key in keys)
+
+
+def _parse_command(cmd_data: Mapping[str, Any], group_name: str) -> Command:
+    """Build a Command from one TOML command table."""
+    name, exec_str = _validate_mandatory_keys(cmd_data, ["name", "exec"], f"command group {group_name}")
+    setenv, passenv = _get_optional_keys(cmd_data, ["setenv", "passenv"], default=None)
+    return Command(name=name, cmd=exec_str, setenv=setenv, passenv=passenv)
+
+
+@lru_cache(maxsize=32)
+def _load_toml(path: str, mtime_ns: int) -> Mapping[str, Any]:  # noqa: ARG001
+    """Parse a TOML file, memoized on (path, mtime) so unchanged files parse once."""
+    if tomllib is not None:
+        with Path(path).open("rb") as toml_file:
+            return tomllib.load(toml_file)
+    with Path(path).open(encoding="utf-8") as toml_file:
+        return tomlkit.parse(toml_file.read())
 
 
 def read_commands_toml(filename: Union[str, Path]) -> list[CommandGroup]:
@@ -274,8 +325,7 @@ def read_commands_toml(filename: Union[str, Path]) -> list[CommandGroup]:
         list[CommandGroup]: A list of CommandGroup objects.
 
     """
-    with Path(filename).open(encoding="utf-8") as toml_file:
-        toml_data = tomlkit.parse(toml_file.read())
+    toml_data = _load_toml(str(filename), Path(filename).stat().st_mtime_ns)
 
     if (isinstance(filename, Path) and filename.name == "pyproject.toml") or (
         isinstance(filename, str) and filename == "pyproject.toml"
@@ -291,9 +341,9 @@ def read_commands_toml(filename: Union[str, Path]) -> list[CommandGroup]:
     command_groups = []
     for group_data in cmd_groups_data.get("groups", []):
         (group_name,) = _validate_mandatory_keys(group_data, ["name"], "top level par-run group")
-        group_desc, group_timeout = _get_optional_keys(
+        group_desc, group_timeout, group_max_parallel = _get_optional_keys(
             group_data,
-            ["desc", "timeout"],
+            ["desc", "timeout", "max_parallel"],
             default=None,
         )
         (group_cont_on_fail, group_serial) = _get_optional_keys(group_data, ["cont_on_fail", "serial"], default=False)
@@ -303,17 +353,13 @@ def read_commands_toml(filename: Union[str, Path]) -> list[CommandGroup]:
         group_cont_on_fail = bool(group_cont_on_fail and group_cont_on_fail is True)
         group_serial = bool(group_serial and group_serial is True)
 
-        commands = OrderedDict()
-        for cmd_data in group_data.get("commands", []):
-            name, exec_str = _validate_mandatory_keys(cmd_data, ["name", "exec"], f"command group {group_name}")
-            setenv, passenv = _get_optional_keys(cmd_data, ["setenv", "passenv"], default=None)
-
-            commands[name] = Command(name=name, cmd=exec_str, setenv=setenv, passenv=passenv)
+        parsed_cmds = (_parse_command(cmd_data, group_name) for cmd_data in group_data.get("commands", []))
         command_group = CommandGroup(
             name=group_name,
             desc=group_desc,
-            cmds=commands,
+            cmds={cmd.name: cmd for cmd in parsed_cmds},
             timeout=group_timeout,
+            max_parallel=group_max_parallel,
             cont_on_fail=group_cont_on_fail,
             serial=group_serial,
         )
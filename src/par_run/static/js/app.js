@@ -27,7 +27,9 @@ document.addEventListener('DOMContentLoaded', function() {
             // If output is an object but not a ret_code, stringify it
             return JSON.stringify(output);
         } else {
-            return output; // Return the original output message
+            // Batched frames join lines with '\n'; show only the latest line
+            const lines = String(output).split('\n');
+            return lines[lines.length - 1];
         }
     }
     
@@ -156,9 +158,12 @@ document.addEventListener('DOMContentLoaded', function() {
                 return;
             }
 
-            const p = document.createElement('p');
-            p.textContent = output;
-            outputContainer.appendChild(p);
+            // Batched frames carry several lines joined with '\n'; render one <p> per line
+            output.split('\n').forEach(line => {
+                const p = document.createElement('p');
+                p.textContent = line;
+                outputContainer.appendChild(p);
+            });
             // Scroll to the bottom to show the latest output
             outputContainer.scrollTop = outputContainer.scrollHeight;
         
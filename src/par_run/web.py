@@ -1,5 +1,7 @@
 """Web UI Module"""
 
+import contextlib
+import json
 from pathlib import Path
 
 import rich
@@ -7,6 +9,7 @@ from fastapi import FastAPI, Request, WebSocket
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from fastapi.websockets import WebSocketState
 
 from .executor import Command, CommandGroup, CommandStatus, ProcessingStrategy, read_commands_toml
 
@@ -17,6 +20,13 @@ ws_app.mount("/static", StaticFiles(directory=str(BASE_PATH / "static")), name="
 templates = Jinja2Templates(directory=str(BASE_PATH / "templates"))
 
 
+@ws_app.on_event("startup")
+async def prewarm_commands_config() -> None:
+    """Parse commands.toml once at startup so the first request hits a warm cache."""
+    with contextlib.suppress(OSError, ValueError):
+        read_commands_toml("commands.toml")
+
+
 @ws_app.get("/")
 async def ws_main(request: Request) -> HTMLResponse:
     """Get the main page."""
@@ -32,21 +42,43 @@ async def get_commands_config() -> list[CommandGroup]:
 class WebCommandCB:
     """Websocket command callbacks."""
 
+    # Per-line path: lines buffered per command before a frame goes out. The chunk
+    # path flushes on every batch, so latency stays bounded by subprocess output
+    flush_threshold = 32
+
     def __init__(self, ws: WebSocket) -> None:
         self.ws = ws
+        self._pending: dict[str, list[str]] = {}
+
+    async def _flush(self, cmd: Command) -> None:
+        pending = self._pending.pop(cmd.name, None)
+        if pending:
+            await self.ws.send_json({"commandName": cmd.name, "output": "\n".join(pending)})
 
     async def on_start(self, cmd: Command) -> None:
         rich.print(f"[blue bold]Started command {cmd.name}[/]")
 
     async def on_recv(self, cmd: Command, output: str) -> None:
-        await self.ws.send_json({"commandName": cmd.name, "output": output})
+        pending = self._pending.setdefault(cmd.name, [])
+        pending.append(output)
+        if len(pending) >= self.flush_threshold:
+            await self._flush(cmd)
+
+    async def on_recv_batch(self, cmd: Command, lines: list[str]) -> None:
+        pending = self._pending.setdefault(cmd.name, [])
+        pending.extend(lines)
+        # A chunk boundary is the latency bound: ship whatever has accumulated so a
+        # command that goes quiet after a few lines still shows them live
+        await self._flush(cmd)
 
     async def on_term(self, cmd: Command, exit_code: int) -> None:
         if cmd.status == CommandStatus.SUCCESS:
             rich.print(f"[green bold]Command {cmd.name} finished[/]")
         elif cmd.status == CommandStatus.FAILURE:
             rich.print(f"[red bold]Command {cmd.name} failed, {exit_code=:}[/]")
-        await self.ws.send_json({"commandName": cmd.name, "output": {"ret_code": exit_code}})
+        await self._flush(cmd)
+        # Trivial fixed shape; format it directly instead of a dumps() pass per command
+        await self.ws.send_text(f'{{"commandName": {json.dumps(cmd.name)}, "output": {{"ret_code": {exit_code}}}}}')
 
 
 @ws_app.websocket_route("/ws")
@@ -60,5 +92,11 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
     rich.print("Websocket command cb created")
     for grp in master_groups:
         await grp.run(ProcessingStrategy.ON_RECV, cb)
+        if websocket.client_state is not WebSocketState.CONNECTED:
+            # A disconnect during the run surfaces as failed sends inside the
+            # callbacks, which the group's error handling absorbs; check the
+            # socket here so we stop launching groups at a dead client
+            rich.print("[yellow]Websocket disconnected, aborting remaining groups[/]")
+            break
         if grp.status != CommandStatus.SUCCESS and not grp.cont_on_fail:
             break